@@ -0,0 +1,63 @@
+"""Sentencias SQL de la app (dialecto DuckDB), compartidas por la conexión y las consultas."""
+
+# Agregación de primas por póliza: el unnest de `coverages` corre una sola vez al inicializar la BD.
+POLICY_PREMIUMS_SQL = """
+CREATE TABLE policy_premiums AS
+SELECT policy_id,
+       SUM(CAST(json_extract(cov.value, '$.premium') AS DOUBLE)) AS prima_total
+FROM   policies
+CROSS  JOIN json_each(policies.coverages) AS cov
+GROUP  BY policy_id;
+"""
+
+# Consulta 1: conteo de vehículos activos por marca/modelo/año (`?` = máximo de filas).
+QUERY1 = """
+SELECT
+    vehicle_brand AS marca,
+    vehicle_model AS modelo,
+    vehicle_year  AS año,
+    COUNT(*) AS cantidad
+FROM policies
+WHERE status = 'active'
+  AND vehicle_brand IS NOT NULL
+  AND vehicle_model IS NOT NULL
+  AND vehicle_year  IS NOT NULL
+GROUP BY marca, modelo, año
+ORDER BY cantidad DESC
+LIMIT ?;
+"""
+
+# Top‑10 marcas del gráfico de la Consulta 1, agregado en el motor y no en pandas.
+QUERY1_TOP_BRAND = """
+SELECT vehicle_brand AS marca,
+       COUNT(*) AS cantidad
+FROM policies
+WHERE status = 'active'
+  AND vehicle_brand IS NOT NULL
+  AND vehicle_model IS NOT NULL
+  AND vehicle_year  IS NOT NULL
+GROUP BY marca
+ORDER BY cantidad DESC, marca
+LIMIT 10;
+"""
+
+# Consulta 2: prima total por póliza (lee la tabla precalculada `policy_premiums`).
+# El `?` del LIMIT es la cantidad de filas elegida en la UI.
+QUERY2 = """
+SELECT *
+FROM   policy_premiums
+ORDER  BY prima_total DESC
+LIMIT  ?;
+"""
+
+# Consulta 3: próxima cuota pendiente por póliza. La fecha de hoy llega como parámetro
+# para que sea una constante para el planner y forme parte de la clave de caché.
+QUERY3 = """
+SELECT policy_id, fee_id, due_date, amount
+FROM   fees
+WHERE  status IN ('pending','overdue')
+  AND  due_date >= ?
+QUALIFY ROW_NUMBER() OVER (PARTITION BY policy_id ORDER BY due_date, fee_id) = 1
+ORDER  BY policy_id
+LIMIT  100;
+"""
@@ -0,0 +1,105 @@
+"""Convierte una única vez los CSV de data/ a Parquet (ZSTD + estadísticas por columna).
+
+Uso:
+    python scripts/csv_to_parquet.py
+"""
+from pathlib import Path
+
+import duckdb
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+# Tipos explícitos por archivo: se omite la inferencia (que con sample_size=-1 recorre todo
+# el CSV antes de cargarlo) y las fechas se parsean con formato fijo.
+COLUMN_TYPES = {
+    "bot_conversations_sample": {
+        "conversation_id": "VARCHAR",
+        "customer_id": "BIGINT",
+        "start_time": "TIMESTAMP",
+        "end_time": "TIMESTAMP",
+        "intents_detected": "VARCHAR",
+        "conversation_successful": "BOOLEAN",
+        "transferred_to_agent": "BOOLEAN",
+        "customer_feedback_score": "BIGINT",
+    },
+    "claims_sample": {
+        "claim_id": "VARCHAR",
+        "policy_number": "VARCHAR",
+        "incident_date": "DATE",
+        "claim_amount": "DOUBLE",
+        "claim_status": "VARCHAR",
+        "vehicle_license_plate": "VARCHAR",
+        "insured_full_name": "VARCHAR",
+    },
+    "customers": {
+        "customer_id": "BIGINT",
+        "full_name": "VARCHAR",
+        "email": "VARCHAR",
+        "birth_date": "DATE",
+        "created_at": "TIMESTAMP",
+    },
+    "fees": {
+        "fee_id": "BIGINT",
+        "policy_id": "BIGINT",
+        "due_date": "DATE",
+        "amount": "DOUBLE",
+        "status": "VARCHAR",
+        "paid_at": "TIMESTAMP",
+    },
+    "policies": {
+        "policy_id": "BIGINT",
+        "customer_id": "BIGINT",
+        "policy_number": "VARCHAR",
+        "vehicle": "VARCHAR",
+        "coverages": "VARCHAR",
+        "start_date": "DATE",
+        "end_date": "DATE",
+        "monthly_premium": "DOUBLE",
+        "status": "VARCHAR",
+    },
+}
+
+# Columnas derivadas que se materializan al convertir, para no parsear JSON en cada consulta.
+DERIVED_COLUMNS = {
+    "policies": (
+        "json_extract_string(vehicle, '$.brand') AS vehicle_brand, "
+        "json_extract_string(vehicle, '$.model') AS vehicle_model, "
+        "CAST(json_extract_string(vehicle, '$.year') AS INTEGER) AS vehicle_year"
+    ),
+}
+
+
+# Orden físico de las filas: con fees ordenado por due_date cada row group cubre un rango
+# acotado de fechas, y sus min/max permiten que `due_date >= ?` (Consulta 3) descarte bloques.
+SORT_KEYS = {
+    "fees": "due_date, policy_id",
+}
+
+
+def convert(con: duckdb.DuckDBPyConnection, csv_path: Path) -> Path:
+    """Escribe `<stem>.parquet` junto al CSV y retorna su ruta."""
+    parquet_path = csv_path.with_suffix(".parquet")
+    derived = DERIVED_COLUMNS.get(csv_path.stem)
+    select = f"*, {derived}" if derived else "*"
+    order_by = f" ORDER BY {SORT_KEYS[csv_path.stem]}" if csv_path.stem in SORT_KEYS else ""
+    column_types = COLUMN_TYPES.get(csv_path.stem)
+    if column_types:
+        types = ", ".join(f"'{col}': '{typ}'" for col, typ in column_types.items())
+        options = f"types={{{types}}}, dateformat='%Y-%m-%d', timestampformat='%Y-%m-%dT%H:%M:%S'"
+    else:
+        # CSV sin tipos declarados: DuckDB los infiere leyendo el archivo completo.
+        options = "sample_size=-1"
+    con.execute(
+        f"COPY (SELECT {select} FROM read_csv('{csv_path.as_posix()}', header=True, {options}){order_by}) "
+        f"TO '{parquet_path.as_posix()}' (FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 100000)"
+    )
+    return parquet_path
+
+
+if __name__ == "__main__":
+    con = duckdb.connect()
+    # Sin orden de inserción que preservar, COPY lee el CSV por rangos de bytes en paralelo
+    # y escribe row group a row group: la memoria queda acotada aunque el archivo crezca.
+    con.execute("SET preserve_insertion_order = false")
+    for csv_path in sorted(DATA_DIR.glob("*.csv")):
+        print(f"{csv_path.name} → {convert(con, csv_path).name}")
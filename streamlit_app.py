@@ -1,66 +1,81 @@
 import streamlit as st
 import pandas as pd
-import sqlite3
+import pyarrow as pa
+import duckdb
+import os
 from datetime import date, timedelta
+from pathlib import Path
+
+import queries
 
 st.set_page_config(page_title="Prueba Técnica SQL", layout="wide")
 st.title("Prueba Técnica – SQL & Casos de Uso")
 
 # --------  Utils & Data -------------------------------------------------------------------
 
-def load_data():
-    """Carga los CSV sintetizados y retorna DataFrames."""
-    policies = pd.read_csv('data/policies.csv', dtype={'status': str, 'vehicle': str, 'coverages': str})
-    fees     = pd.read_csv('data/fees.csv', dtype={'status': str}, parse_dates=['due_date'])
-    return policies, fees
-
 @st.cache_resource(show_spinner="Inicializando base en memoria…")
-def get_connection() -> sqlite3.Connection:
-    """Carga los CSV en una BD SQLite en memoria (multi-thread)."""
-    policies, fees = load_data()
-    conn = sqlite3.connect(":memory:", check_same_thread=False)
-    policies.to_sql('policies', conn, index=False, if_exists='replace')
-    fees.to_sql('fees', conn, index=False, if_exists='replace')
+def get_connection() -> duckdb.DuckDBPyConnection:
+    """Registra los Parquet de data/ como vistas DuckDB y precalcula policy_premiums."""
+    conn = duckdb.connect()
+    # json viene enlazada en el wheel de DuckDB: LOAD basta y no descarga nada en el arranque.
+    conn.execute("LOAD json")
+    conn.execute(f"PRAGMA threads={os.cpu_count() or 1}")
+    conn.execute("PRAGMA memory_limit='1GB'")
+    conn.execute("SET parquet_metadata_cache = true")  # cachea metadata de Parquet entre escaneos
+    for path in sorted(Path("data").glob("*.parquet")):
+        conn.execute(f"CREATE VIEW {path.stem} AS SELECT * FROM read_parquet('{path.as_posix()}')")
+    conn.execute(queries.POLICY_PREMIUMS_SQL)
     return conn
 
 conn = get_connection()
 
-# --------  Tabs ---------------------------------------------------------------------------
+@st.cache_data(ttl=3600, show_spinner=False)
+def run_sql(sql: str, params: tuple = ()) -> pa.Table:
+    """Ejecuta `sql` con `params` y retorna el resultado como tabla Arrow (cacheada)."""
+    with conn.cursor() as cur:  # un cursor por llamada: cada sesión de Streamlit corre en su hilo
+        return cur.sql(sql, params=list(params)).to_arrow_table()
 
-tab1, tab2, tab3 = st.tabs([
-    "Sección 1: Consultas SQL",
-    "Sección 2: Casos de Uso",
-    "Sección 3: Pregunta Abierta"
-])
+@st.cache_resource
+def get_roadmap_df() -> pd.DataFrame:
+    """Tabla estática de limitaciones y roadmap (Sección 4)."""
+    return pd.DataFrame({
+        'Limitación actual': [
+            'Datos anidados en JSONB',
+            'Sin historización de cambios',
+            'Escalabilidad OLAP',
+            'Seguridad PII/PCI',
+            'Rendimiento en consultas temporales'
+        ],
+        'Mejora propuesta': [
+            'Normalizar tablas vehicle / coverages',
+            'SCD‑Type 2 o snapshots diarios',
+            'Data Lake bronze‑silver‑gold (Parquet/Iceberg)',
+            'RLS + cifrado transparente',
+            'Particionamiento por rango (created_at) + índices parciales'
+        ],
+        'Justificación': [
+            'Índices simples, FKs, JOINs eficientes',
+            'Auditoría, GDPR/CCPA compliance',
+            'Coste/GB bajo + compute elástico',
+            'Minimizar riesgo de fuga de datos',
+            'Menor I/O y tiempos < 200 ms'
+        ]
+    })
 
-# ==========================================================================================
-# TAB 1 – CONSULTAS SQL 
-# ==========================================================================================
-with tab1:
-    # -------------------- Consulta 1 ------------------------------------------------------
+# --------  Consultas SQL (cada una en su fragment) ---------------------------------------
+
+@st.fragment
+def consulta1():
+    """Consulta 1: conteo de vehículos activos por marca/modelo/año."""
     st.header("1. Conteo de vehículos activos")
-    query1 = """
-SELECT
-    json_extract(vehicle, '$.brand')  AS marca,
-    json_extract(vehicle, '$.model')  AS modelo,
-    CAST(json_extract(vehicle, '$.year') AS INTEGER) AS año,
-    COUNT(*) AS cantidad
-FROM policies
-WHERE status = 'active'
-  AND json_extract(vehicle, '$.brand') IS NOT NULL
-  AND json_extract(vehicle, '$.model') IS NOT NULL
-  AND json_extract(vehicle, '$.year')  IS NOT NULL
-GROUP BY marca, modelo, año
-ORDER BY cantidad DESC;
-"""
-    st.code(query1, language='sql')
+    st.code(queries.QUERY1, language='sql')
+    n_rows = st.slider("Filas", 10, 500, 100, key="filas_consulta1")
     if st.button("🔍 Ejecutar Consulta 1"):
-        df1 = pd.read_sql(query1, conn)
-        st.dataframe(df1, use_container_width=True)
-        if not df1.empty:
+        tbl1 = run_sql(queries.QUERY1, (n_rows,))
+        st.dataframe(tbl1, use_container_width=True)
+        if tbl1.num_rows:
             st.caption("Distribución de vehículos activos por marca (top‑10)")
-            top_brand = df1.groupby('marca', as_index=False)['cantidad'].sum().nlargest(10, 'cantidad')
-            st.bar_chart(top_brand.set_index('marca'))
+            st.bar_chart(run_sql(queries.QUERY1_TOP_BRAND), x='marca', y='cantidad')
 
     st.subheader("¿Por qué es valioso este conteo?")
     st.markdown(
@@ -78,22 +93,16 @@ El conteo de vehículos activos permite detectar tendencias de riesgo por marca,
         """
     )
 
-    st.divider()
 
-    # -------------------- Consulta 2 ------------------------------------------------------
+@st.fragment
+def consulta2():
+    """Consulta 2: prima total por póliza."""
     st.header("2. Prima total por póliza")
-    query2 = """
-SELECT policy_id,
-       SUM(CAST(json_extract(cov.value, '$.premium') AS REAL)) AS prima_total
-FROM   policies
-CROSS  JOIN json_each(policies.coverages) AS cov
-GROUP  BY policy_id
-ORDER  BY prima_total DESC;
-"""
-    st.code(query2, language='sql')
+    st.code(queries.POLICY_PREMIUMS_SQL + queries.QUERY2, language='sql')
+    n_rows = st.slider("Filas", 5, 100, 15, key="filas_consulta2")
     if st.button("💰 Ejecutar Consulta 2"):
-        df2 = pd.read_sql(query2, conn)
-        st.dataframe(df2.head(15), use_container_width=True)
+        tbl2 = run_sql(queries.QUERY2, (n_rows,))
+        st.dataframe(tbl2, use_container_width=True)
 
     st.subheader("¿Por qué sumar las primas?")
     st.markdown(
@@ -112,31 +121,18 @@ La prima total por póliza constituye el insumo central para **Finanzas** al pro
         """
     )
 
-    st.divider()
 
-    # -------------------- Consulta 3 ------------------------------------------------------
+@st.fragment
+def consulta3():
+    """Consulta 3: próxima cuota pendiente por póliza."""
     st.header("3. Próxima cuota pendiente")
-    query3 = """
-SELECT f.policy_id, f.fee_id, f.due_date, f.amount
-FROM   fees AS f
-WHERE  f.status IN ('pending','overdue')
-  AND  f.due_date >= date('now')
-  AND  f.due_date = (
-        SELECT MIN(due_date)
-        FROM   fees
-        WHERE  policy_id = f.policy_id
-          AND  status IN ('pending','overdue')
-          AND  due_date >= date('now'))
-ORDER  BY f.policy_id;
-"""
-    st.code(query3, language='sql')
+    st.code(queries.QUERY3, language='sql')
     if st.button("⏰ Ejecutar Consulta 3"):
-        df3 = pd.read_sql(query3, conn)
-        if not df3.empty:
-            df3['due_date'] = pd.to_datetime(df3['due_date'])
-        st.dataframe(df3, use_container_width=True)
-        if not df3.empty:
-            st.caption(f"Recordatorio: la próxima cuota de la póliza #{df3.iloc[0]['policy_id']} vence el {df3.iloc[0]['due_date'].date()} ✉️")
+        tbl3 = run_sql(queries.QUERY3, (date.today(),))
+        st.dataframe(tbl3, use_container_width=True)
+        if tbl3.num_rows:
+            first = tbl3.slice(0, 1).to_pylist()[0]
+            st.caption(f"Recordatorio: la próxima cuota de la póliza #{first['policy_id']} vence el {first['due_date']} ✉️")
 
     st.subheader("¿Por qué necesitamos la próxima cuota?")
     st.markdown(
@@ -145,35 +141,38 @@ Conocer la próxima cuota pendiente habilita a **Cobranza** a programar recordat
         """
     )
 
+
+# --------  Tabs ---------------------------------------------------------------------------
+
+tab1, tab2, tab3 = st.tabs([
+    "Sección 1: Consultas SQL",
+    "Sección 2: Casos de Uso",
+    "Sección 3: Pregunta Abierta"
+])
+
+# ==========================================================================================
+# TAB 1 – CONSULTAS SQL 
+# ==========================================================================================
+with tab1:
+    # -------------------- Consulta 1 ------------------------------------------------------
+    consulta1()
+
+    st.divider()
+
+    # -------------------- Consulta 2 ------------------------------------------------------
+    consulta2()
+
+    st.divider()
+
+    # -------------------- Consulta 3 ------------------------------------------------------
+    consulta3()
+
     st.divider()
 
      # -------------------- Sección 4 --------------------------------------------------------
     st.header("4. Limitaciones y roadmap de mejora")
 
-    roadmap_df = pd.DataFrame({
-        'Limitación actual': [
-            'Datos anidados en JSONB',
-            'Sin historización de cambios',
-            'Escalabilidad OLAP',
-            'Seguridad PII/PCI',
-            'Rendimiento en consultas temporales'
-        ],
-        'Mejora propuesta': [
-            'Normalizar tablas vehicle / coverages',
-            'SCD‑Type 2 o snapshots diarios',
-            'Data Lake bronze‑silver‑gold (Parquet/Iceberg)',
-            'RLS + cifrado transparente',
-            'Particionamiento por rango (created_at) + índices parciales'
-        ],
-        'Justificación': [
-            'Índices simples, FKs, JOINs eficientes',
-            'Auditoría, GDPR/CCPA compliance',
-            'Coste/GB bajo + compute elástico',
-            'Minimizar riesgo de fuga de datos',
-            'Menor I/O y tiempos < 200 ms'
-        ]
-    })
-    st.dataframe(roadmap_df, use_container_width=True, hide_index=True)
+    st.dataframe(get_roadmap_df(), use_container_width=True, hide_index=True)
 
 # ==========================================================================================
 # TAB 2 – CASOS DE USO 